@@ -6,12 +6,24 @@ Pilih file JSON lewat dialog, lalu konversi menjadi:
  - 1 file Excel (.xlsx) dengan multi-sheet (sheet per table), dan
  - 1 file CSV gabungan (semua sheet dikombinasi). Jika pandas tersedia,
    CSV akan berisi kolom tambahan "__sheet" yang memberi tahu asal baris.
+
+Opsi: --direct-xml  tulis .xlsx langsung sebagai XML (tanpa pandas/openpyxl).
+
+Bila pyarrow terpasang, CSV ditulis oleh pyarrow: semua string (termasuk
+header) diberi tanda kutip dan float bulat ditulis tanpa ".0" (2.0 -> 2).
+Tanpa pyarrow, CSV ditulis pandas dengan quoting minimal.
 """
 
 import json
+import math
 import os
+import re
 import sys
+import zipfile
 from datetime import datetime
+from itertools import repeat
+from operator import itemgetter
+from xml.sax.saxutils import escape, quoteattr
 
 # GUI for file dialogs
 try:
@@ -28,6 +40,46 @@ try:
 except Exception:
     USE_PANDAS = False
 
+# try orjson (parser JSON berbasis C, lebih cepat dari json.loads)
+try:
+    import orjson
+
+    def _loads(data):
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson lebih ketat (NaN, int > 64-bit, BOM): coba parser standar
+            # (json.loads tidak menerima memoryview, jadi disalin ke bytes)
+            return json.loads(bytes(data))
+except Exception:
+    orjson = None
+
+# try mmap (file JSON besar dibaca tanpa salinan penuh di memori)
+try:
+    import mmap
+except Exception:
+    mmap = None
+
+# try ijson (parse JSON secara streaming, record diproses sambil dibaca)
+try:
+    import ijson
+except Exception:
+    ijson = None
+
+# try pyarrow (CSV writer C++ yang jauh lebih cepat dari DataFrame.to_csv)
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+except Exception:
+    pa = None
+
+# try xlsxwriter (engine Excel utama: mode constant_memory, streaming per baris)
+try:
+    import xlsxwriter
+except Exception:
+    xlsxwriter = None
+
 # try openpyxl fallback
 try:
     from openpyxl import Workbook
@@ -36,162 +88,397 @@ except Exception:
     Workbook = None
 
 # ---------- utilities ----------
+# satu encoder dipakai ulang untuk semua nilai list (json.dumps membuat
+# JSONEncoder baru di setiap panggilan karena ensure_ascii=False)
+_encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+
 def print_instructions():
     print("=" * 60)
     print(" 📌 INSTRUKSI PENGGUNAAN PROGRAM JSON → Excel & CSV ")
     print("=" * 60)
     print("1. Pastikan sudah install dependency (sekali saja):")
     print("   pip install pandas openpyxl")
-    print("   (jika tidak bisa install pandas, setidaknya: pip install openpyxl)\n")
+    print("   (jika tidak bisa install pandas, setidaknya: pip install openpyxl)")
+    print("   (opsional, lebih cepat: pip install xlsxwriter orjson ijson pyarrow)\n")
     print("2. Setelah program berjalan, pilih file JSON yang ingin Anda konversi.")
     print("3. Tentukan nama & lokasi penyimpanan file Excel (.xlsx).")
     print("   Program juga akan membuat file CSV (.csv) dengan nama yang sama (hanya ekstensi berubah).")
     print("4. Selesai! Periksa folder yang Anda pilih untuk menemukan kedua file.\n")
     print("=" * 60, "\n")
 
-def flatten(d, parent_key='', sep='.'):
-    items = {}
-    if isinstance(d, dict):
-        for k, v in d.items():
-            new_key = f"{parent_key}{sep}{k}" if parent_key else k
-            if isinstance(v, dict):
-                items.update(flatten(v, new_key, sep=sep))
-            elif isinstance(v, list):
-                items[new_key] = json.dumps(v, ensure_ascii=False)
+def flatten(d, parent_key='', sep='.',
+            _isinstance=isinstance, _dict=dict, _list=list, _encode=_encode):
+    # builtin di-bind sebagai default arg -> LOAD_FAST, bukan LOAD_GLOBAL
+    # iteratif (stack berisi iterator) supaya tanpa rekursi & tanpa merge dict
+    # per level; urutan kolom tetap sama seperti versi rekursif
+    if not _isinstance(d, _dict):
+        return {parent_key: d}
+    out = {}
+    stack = [(parent_key, iter(d.items()))]
+    while stack:
+        parent, it = stack[-1]
+        for k, v in it:
+            key = parent + sep + str(k) if parent else k
+            if _isinstance(v, _dict):
+                stack.append((key, iter(v.items())))
+                break
+            elif _isinstance(v, _list):
+                out[key] = _encode(v)
             else:
-                items[new_key] = v
-    else:
-        items[parent_key] = d
-    return items
+                out[key] = v
+        else:
+            stack.pop()
+    return out
+
+def make_sheets_from_obj(obj, flat=True, _isinstance=isinstance, _dict=dict, _list=list):
+    # flat=False: baris dict dibiarkan nested (untuk jalur pandas, yang
+    # meratakannya sendiri per sheet di normalize_rows)
+    if _isinstance(obj, _list):
+        return sheets_from_items(obj, flat)
+    if _isinstance(obj, _dict):
+        return sheets_from_kvitems(obj.items(), flat)
+    return {'Sheet1': [{'value': _encode(obj)}]}
+
+def sheets_from_items(items, flat=True, _isinstance=isinstance, _dict=dict, _list=list):
+    # JSON berbentuk list -> satu sheet; items boleh berupa iterator (streaming)
+    row = flatten if flat else (lambda d: d)
+    rows = []
+    for item in items:
+        if _isinstance(item, _dict):
+            rows.append(row(item))
+        elif flat and _isinstance(item, _list):
+            # baris datar hanya berisi skalar (writer Excel tidak menerima list)
+            rows.append({'value': _encode(item)})
+        else:
+            rows.append({'value': item})
+    return {'Sheet1': rows}
 
-def make_sheets_from_obj(obj):
+def sheets_from_kvitems(kvitems, flat=True, _isinstance=isinstance, _dict=dict, _list=list):
+    # JSON berbentuk dict -> sheet per key berisi list, sisanya ke 'Summary';
+    # kvitems boleh berupa iterator (streaming)
+    row = flatten if flat else (lambda d: d)
     sheets = {}
-    if isinstance(obj, list):
-        rows = []
-        for item in obj:
-            if isinstance(item, dict):
-                rows.append(flatten(item))
+    remaining = {}
+    for k, v in kvitems:
+        if _isinstance(v, _list):
+            if all(_isinstance(i, _dict) for i in v):
+                rows = [row(i) for i in v]
+                sheets[str(k)] = rows
             else:
-                rows.append({'value': item})
-        sheets['Sheet1'] = rows
-        return sheets
-
-    if isinstance(obj, dict):
-        remaining = {}
-        for k, v in obj.items():
-            if isinstance(v, list):
-                if all(isinstance(i, dict) for i in v):
-                    rows = [flatten(i) for i in v]
-                    sheets[str(k)] = rows
-                else:
-                    rows = [{'value': json.dumps(i, ensure_ascii=False)} for i in v]
-                    sheets[str(k)] = rows
-            else:
-                remaining[k] = v
-        if remaining:
-            sheets['Summary'] = [flatten(remaining)]
-        if not sheets:
-            sheets['Sheet1'] = [flatten(obj)]
-        return sheets
-
-    sheets['Sheet1'] = [{'value': json.dumps(obj, ensure_ascii=False)}]
+                rows = [{'value': _encode(i)} for i in v]
+                sheets[str(k)] = rows
+        else:
+            remaining[k] = v
+    if remaining:
+        sheets['Summary'] = [row(remaining)]
+    if not sheets:
+        # dict kosong
+        sheets['Sheet1'] = [row({})]
     return sheets
 
+def make_sheets_raw(obj):
+    return make_sheets_from_obj(obj, flat=False)
+
+def normalize_rows(rows):
+    # rows mentah -> DataFrame datar. Sheet yang sudah datar (kasus umum)
+    # langsung jadi DataFrame tanpa flatten; hanya sheet yang berisi dict/list
+    # di-flatten (urutan kolom & encoding list sama dengan engine lain).
+    if any(type(v) is dict or type(v) is list for r in rows for v in r.values()):
+        return pd.DataFrame([flatten(r) for r in rows])
+    first_keys = rows[0].keys()
+    if all(r.keys() == first_keys for r in rows):
+        return pd.DataFrame(rows, columns=list(first_keys))
+    return pd.DataFrame(rows)
+
+# karakter yang tidak boleh ada di nama sheet Excel -> '_'
+_SHEET_TRANS = str.maketrans({c: '_' for c in '\\/*?:[]'})
+
 def sanitize_sheet_name(name, default='Sheet'):
-    invalid = ['\\', '/', '*', '?', ':', '[', ']']
-    s = ''.join('_' if ch in invalid else ch for ch in str(name))
-    s = s.strip()
-    if not s:
-        s = default
-    return s[:31]
+    s = str(name).translate(_SHEET_TRANS).strip()
+    # Excel (dan xlsxwriter) menolak nama sheet yang diawali/diakhiri apostrof
+    s = s.strip("'").strip()[:31].rstrip("'")
+    return s or default
+
+def unique_sheet_name(raw_name, taken):
+    # nama sheet valid & unik; taken = set nama (lowercase) yang sudah dipakai,
+    # karena Excel membandingkan nama sheet tanpa membedakan huruf besar/kecil
+    name = sanitize_sheet_name(raw_name, default='Sheet')
+    base = name
+    i = 1
+    while name.lower() in taken:
+        name = (base[:28] + f"_{i}") if len(base) > 28 else f"{base}_{i}"
+        i += 1
+    taken.add(name.lower())
+    return name
+
+def row_tuples(rows, headers):
+    # baris dict -> tuple posisional sesuai urutan headers (key hilang -> "")
+    if not headers:
+        return [() for _ in rows]
+    first_keys = rows[0].keys()
+    if all(r.keys() == first_keys for r in rows):
+        # skema seragam: satu panggilan itemgetter (C) per baris
+        getter = itemgetter(*headers)
+        if len(headers) == 1:
+            return [(v,) for v in map(getter, rows)]
+        return list(map(getter, rows))
+    return [tuple(map(r.get, headers, repeat(""))) for r in rows]
 
 # ---------- Excel writers ----------
-def write_excel_with_pandas(sheets, filename):
-    with pd.ExcelWriter(filename, engine='openpyxl') as writer:
-        for raw_name, rows in sheets.items():
-            name = sanitize_sheet_name(raw_name, default='Sheet')
-            if not rows:
-                pd.DataFrame().to_excel(writer, sheet_name=name, index=False)
+# lebar kolom maksimum (karakter) untuk semua writer Excel
+_MAX_COL_WIDTH = 60
+
+def collect_headers(rows):
+    # satu pass: urutan header (dict menjaga urutan, cek key O(1)) + lebar
+    # kolom maksimum dari data sumber, sebelum baris pertama ditulis
+    # (workbook write-only butuh lebar kolom di depan)
+    cap = _MAX_COL_WIDTH - 2
+    widths = {}
+    for r in rows:
+        for k, v in r.items():
+            w = widths.get(k)
+            if w is None:
+                w = widths[k] = len(str(k))
+            # kolom yang sudah mentok batas tidak perlu str() lagi
+            if v is None or w >= cap:
                 continue
-            try:
-                df = pd.json_normalize(rows)
-            except Exception:
-                df = pd.DataFrame(rows)
-            base = name
-            i = 1
-            while name in writer.sheets:
-                name = (base[:28] + f"_{i}") if len(base) > 28 else f"{base}_{i}"
-                i += 1
-            df.to_excel(writer, sheet_name=name, index=False)
+            l = len(v) if type(v) is str else len(str(v))
+            if l > w:
+                widths[k] = l
+    return list(widths), widths
+
+def normalize_sheets(sheets):
+    # name -> DataFrame, dinormalisasi sekali lalu dipakai Excel & CSV sekaligus
+    return {name: normalize_rows(rows) if rows else pd.DataFrame()
+            for name, rows in sheets.items()}
+
+def write_excel_with_pandas(sheets, filename):
+    write_excel_with_pandas_dfs(normalize_sheets(sheets), filename)
+
+def write_excel_with_pandas_dfs(dfs, filename):
+    # DataFrame -> tuple -> workbook write-only openpyxl (tanpa pd.ExcelWriter
+    # / to_excel yang memformat sel satu per satu dan menahan seluruh sheet)
+    if Workbook is None:
+        raise RuntimeError("openpyxl tidak tersedia. Install: pip install openpyxl")
+    wb = Workbook(write_only=True)
+    taken = set()
+    for raw_name, df in dfs.items():
+        name = unique_sheet_name(raw_name, taken)
+        ws = wb.create_sheet(title=name)
+        if not len(df.columns):
+            continue
+        # NaN/NA -> None (sel kosong), seperti to_excel
+        df = df.astype(object).where(df.notna(), None)
+        ws.append(list(df.columns))
+        for row in df.itertuples(index=False, name=None):
+            ws.append(row)
+    wb.save(filename)
+
+def _xlsx_write_float(worksheet, row, col, number, cell_format=None):
+    # NaN/inf -> sel kosong (seperti engine lain); None = pakai write() default
+    if not math.isfinite(number):
+        return worksheet.write_blank(row, col, None, cell_format)
+    return None
+
+# batas panjang isi satu sel Excel
+_XLSX_MAX_STR = 32767
+
+def _xlsx_write_row_checked(ws, r_idx, values, sheet_name):
+    for c_idx, v in enumerate(values):
+        if type(v) is str and len(v) > _XLSX_MAX_STR:
+            print(f"Peringatan: sel {sheet_name}!{_col_letter(c_idx + 1)}{r_idx + 1} "
+                  f"dipotong ke {_XLSX_MAX_STR} karakter (batas Excel).")
+            v = v[:_XLSX_MAX_STR]
+        ret = ws.write(r_idx, c_idx, v)
+        if ret:
+            raise RuntimeError(f"xlsxwriter gagal menulis sel {sheet_name}!"
+                               f"{_col_letter(c_idx + 1)}{r_idx + 1} (kode {ret})")
+
+def write_excel_with_xlsxwriter(sheets, filename):
+    if xlsxwriter is None:
+        raise RuntimeError("xlsxwriter tidak tersedia. Install: pip install xlsxwriter")
+    # constant_memory: baris di-flush ke disk, memori ~ satu baris.
+    # String ditulis apa adanya (bukan formula/URL), NaN/inf -> sel kosong.
+    wb = xlsxwriter.Workbook(filename, {
+        'constant_memory': True,
+        'use_zip64': True,
+        'strings_to_formulas': False,
+        'strings_to_urls': False,
+    })
+    taken = set()
+    for raw_name, rows in sheets.items():
+        name = unique_sheet_name(raw_name, taken)
+        ws = wb.add_worksheet(name)
+        ws.add_write_handler(float, _xlsx_write_float)
+        if not rows:
+            continue
+        headers, widths = collect_headers(rows)
+        for i_col, h in enumerate(headers):
+            ws.set_column(i_col, i_col, min(widths[h] + 2, _MAX_COL_WIDTH))
+        # write_row berhenti di sel pertama yang gagal (mis. string terlalu
+        # panjang) -> ulangi baris itu per sel, dan gagal bila tetap error
+        if ws.write_row(0, 0, headers):
+            _xlsx_write_row_checked(ws, 0, headers, name)
+        for r_idx, t in enumerate(row_tuples(rows, headers), start=1):
+            if ws.write_row(r_idx, 0, t):
+                _xlsx_write_row_checked(ws, r_idx, t, name)
+    wb.close()
 
 def write_excel_with_openpyxl(sheets, filename):
     if Workbook is None:
         raise RuntimeError("openpyxl tidak tersedia. Install: pip install openpyxl")
-    wb = Workbook()
-    default_sheet = wb.active
-    first = True
+    # write-only: baris langsung di-stream ke file, tanpa menyimpan objek Cell
+    wb = Workbook(write_only=True)
+    taken = set()
     for raw_name, rows in sheets.items():
-        name = sanitize_sheet_name(raw_name, default='Sheet')
-        base = name
-        i = 1
-        while name in wb.sheetnames:
-            name = (base[:28] + f"_{i}") if len(base) > 28 else f"{base}_{i}"
-            i += 1
-        if first:
-            ws = default_sheet
-            ws.title = name
-            first = False
-        else:
-            ws = wb.create_sheet(title=name)
+        name = unique_sheet_name(raw_name, taken)
+        ws = wb.create_sheet(title=name)
         if not rows:
             continue
-        # headers collect
-        headers = []
-        for r in rows:
-            for k in r.keys():
-                if k not in headers:
-                    headers.append(k)
-        for col_idx, h in enumerate(headers, start=1):
-            ws.cell(row=1, column=col_idx, value=h)
-        for r_idx, r in enumerate(rows, start=2):
-            for c_idx, h in enumerate(headers, start=1):
-                val = r.get(h, "")
-                ws.cell(row=r_idx, column=c_idx, value=val)
-        # adjust widths
+        # headers collect + lebar kolom dihitung dari data sumber
+        headers, widths = collect_headers(rows)
+        # lebar kolom harus di-set sebelum append pertama
         for i_col, h in enumerate(headers, start=1):
-            col_letter = get_column_letter(i_col)
-            max_len = len(str(h))
-            for cell in ws[col_letter]:
-                if cell.value is not None:
-                    l = len(str(cell.value))
-                    if l > max_len:
-                        max_len = l
-            ws.column_dimensions[col_letter].width = min(max_len + 2, 60)
+            ws.column_dimensions[get_column_letter(i_col)].width = min(widths[h] + 2, _MAX_COL_WIDTH)
+        ws.append(headers)
+        for t in row_tuples(rows, headers):
+            ws.append(t)
     wb.save(filename)
 
+# --- direct XML (tanpa openpyxl): isi sheet ditulis sendiri ke zip .xlsx ---
+_XML_DECL = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+_NS_MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_NS_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_NS_PKG_REL = "http://schemas.openxmlformats.org/package/2006/relationships"
+# karakter kontrol yang tidak valid di XML (openpyxl menolaknya, di sini dibuang)
+_ILLEGAL_XML_RE = re.compile(r'[\000-\010\013\014\016-\037]')
+
+def _col_letter(idx):
+    # 1 -> A, 27 -> AA
+    letters = ''
+    while idx:
+        idx, rem = divmod(idx - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+def _xml_cell(ref, v):
+    if v is None or v == "":
+        return ''
+    if isinstance(v, bool):
+        return f'<c r="{ref}" t="b"><v>{int(v)}</v></c>'
+    if isinstance(v, float) and not math.isfinite(v):
+        # NaN/inf -> sel kosong, seperti engine lain
+        return ''
+    if isinstance(v, (int, float)):
+        return f'<c r="{ref}"><v>{v!r}</v></c>'
+    text = escape(_ILLEGAL_XML_RE.sub('', str(v)))
+    return f'<c r="{ref}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+def _build_sheet_xml(rows):
+    parts = [_XML_DECL, f'<worksheet xmlns="{_NS_MAIN}">']
+    if not rows:
+        parts.append('<sheetData/></worksheet>')
+        return ''.join(parts).encode('utf-8')
+    headers, widths = collect_headers(rows)
+    letters = [_col_letter(i) for i in range(1, len(headers) + 1)]
+    if headers:
+        parts.append('<cols>')
+        for i_col, h in enumerate(headers, start=1):
+            parts.append(f'<col min="{i_col}" max="{i_col}" width="{min(widths[h] + 2, _MAX_COL_WIDTH)}" customWidth="1"/>')
+        parts.append('</cols>')
+    parts.append('<sheetData>')
+    parts.append('<row r="1">' + ''.join(_xml_cell(c + '1', h) for c, h in zip(letters, headers)) + '</row>')
+    for r_idx, t in enumerate(row_tuples(rows, headers), start=2):
+        n = str(r_idx)
+        parts.append(f'<row r="{n}">'
+                     + ''.join(_xml_cell(c + n, v) for c, v in zip(letters, t))
+                     + '</row>')
+    parts.append('</sheetData></worksheet>')
+    return ''.join(parts).encode('utf-8')
+
+def write_excel_direct_xml(sheets, filename):
+    taken = set()
+    names = [unique_sheet_name(raw_name, taken) for raw_name in sheets.keys()]
+    n_sheets = range(1, len(names) + 1)
+    content_types = (
+        _XML_DECL
+        + '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        + '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        + '<Default Extension="xml" ContentType="application/xml"/>'
+        + '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        + ''.join(f'<Override PartName="/xl/worksheets/sheet{i}.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+                  for i in n_sheets)
+        + '</Types>')
+    root_rels = (
+        _XML_DECL
+        + f'<Relationships xmlns="{_NS_PKG_REL}">'
+        + f'<Relationship Id="rId1" Type="{_NS_REL}/officeDocument" Target="xl/workbook.xml"/>'
+        + '</Relationships>')
+    workbook = (
+        _XML_DECL
+        + f'<workbook xmlns="{_NS_MAIN}" xmlns:r="{_NS_REL}"><sheets>'
+        + ''.join(f'<sheet name={quoteattr(name)} sheetId="{i}" r:id="rId{i}"/>'
+                  for i, name in zip(n_sheets, names))
+        + '</sheets></workbook>')
+    workbook_rels = (
+        _XML_DECL
+        + f'<Relationships xmlns="{_NS_PKG_REL}">'
+        + ''.join(f'<Relationship Id="rId{i}" Type="{_NS_REL}/worksheet" Target="worksheets/sheet{i}.xml"/>'
+                  for i in n_sheets)
+        + '</Relationships>')
+    with zipfile.ZipFile(filename, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('[Content_Types].xml', content_types)
+        zf.writestr('_rels/.rels', root_rels)
+        zf.writestr('xl/workbook.xml', workbook)
+        zf.writestr('xl/_rels/workbook.xml.rels', workbook_rels)
+        # serial: pembangunan XML murni Python (memegang GIL) dan kompresi
+        # zlib terjadi di writestr, jadi thread pool tidak memberi percepatan
+        for i, rows in zip(n_sheets, sheets.values()):
+            zf.writestr(f'xl/worksheets/sheet{i}.xml', _build_sheet_xml(rows))
+
 # ---------- CSV writers ----------
-def write_combined_csv_with_pandas(sheets, csv_path):
-    # sheets: dict name -> list of dict rows
-    dfs = []
-    for name, rows in sheets.items():
-        if not rows:
-            continue
+def write_csv_with_pyarrow(df, csv_path):
+    # Arrow menulis bool sebagai true/false; samakan dengan to_csv (True/False).
+    # Beda yang tersisa: semua string di-quote & float bulat ditulis tanpa ".0"
+    arrays = []
+    for col in df.columns:
+        s = df[col]
         try:
-            df = pd.json_normalize(rows)
-        except Exception:
-            df = pd.DataFrame(rows)
-        df['__sheet'] = name
-        dfs.append(df)
-    if dfs:
-        combined = pd.concat(dfs, ignore_index=True, sort=False)
-        # place __sheet as first column
-        cols = combined.columns.tolist()
-        cols = ['__sheet'] + [c for c in cols if c != '__sheet']
-        combined.to_csv(csv_path, index=False, columns=cols)
-    else:
+            arr = pa.array(s, from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # kolom bertipe campuran (mis. int & str) -> string, null tetap null;
+            # supaya satu file CSV selalu ditulis dengan format yang sama
+            arr = pa.array([None if pd.isna(v) else str(v) for v in s], pa.string())
+        if pa.types.is_boolean(arr.type):
+            arr = pc.if_else(arr, 'True', 'False')
+        arrays.append(arr)
+    t = pa.Table.from_arrays(arrays, names=[str(c) for c in df.columns])
+    pacsv.write_csv(t, csv_path)
+
+def write_combined_csv_with_pandas_dfs(dfs, csv_path):
+    # dfs: hasil normalize_sheets (bila engine pandas, dipakai bersama writer Excel)
+    parts = [df.assign(__sheet=name) for name, df in dfs.items() if len(df)]
+    if not parts:
+        _write_combined_frame(None, csv_path)
+        return
+    combined = pd.concat(parts, ignore_index=True, sort=False)
+    # place __sheet as first column
+    combined.insert(0, '__sheet', combined.pop('__sheet'))
+    _write_combined_frame(combined, csv_path)
+
+def _write_combined_frame(combined, csv_path):
+    if combined is None:
         # write empty csv
         with open(csv_path, 'w', encoding='utf-8') as f:
             f.write('')
+        return
+    if pa is not None:
+        try:
+            write_csv_with_pyarrow(combined, csv_path)
+            return
+        except Exception:
+            pass  # mis. kolom bertipe campuran -> pakai pandas to_csv
+    combined.to_csv(csv_path, index=False)
 
 def write_combined_csv_fallback(sheets, csv_path):
     # human-readable fallback: write sheet header then table rows, separate by blank line
@@ -208,60 +495,133 @@ def write_combined_csv_fallback(sheets, csv_path):
             if not rows:
                 continue
             # gather headers
-            headers = []
+            headers = {}
             for r in rows:
-                for k in r.keys():
-                    if k not in headers:
-                        headers.append(k)
-            # write header
+                headers.update(dict.fromkeys(r))
+            headers = list(headers)
+            # write header, lalu rows di-stream ke writerows (loop di C)
             writer.writerow(['__sheet'] + headers)
-            # write rows
-            for r in rows:
-                row = [name] + [r.get(h, "") for h in headers]
-                writer.writerow(row)
+            writer.writerows((name, *t) for t in row_tuples(rows, headers))
+
+# ---------- JSON input ----------
+def load_json_file(json_path):
+    if orjson is None:
+        # parser standar: json.load dari file teks (peak memori paling kecil)
+        with open(json_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    # orjson butuh bytes. Dengan mmap, halaman file dimuat OS sesuai kebutuhan
+    # dan orjson membaca lewat memoryview (tanpa salinan bytes)
+    with open(json_path, 'rb') as f:
+        if mmap is not None:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                mm = None  # mis. file kosong / file khusus
+            if mm is not None:
+                try:
+                    with memoryview(mm) as mv:
+                        return _loads(mv)
+                finally:
+                    mm.close()
+        return _loads(f.read())
+
+def load_sheets_streaming(json_path, flat=True):
+    # list of records / dict of lists di-stream lewat ijson: pohon JSON lengkap
+    # tidak pernah dibuat, hanya baris sheet. None = pakai jalur biasa.
+    # Hanya dipakai dengan backend C (yajl2*) dan bila orjson tidak ada:
+    # orjson+mmap lebih cepat, backend Python ijson jauh lebih lambat.
+    if ijson is None or orjson is not None or not ijson.backend.startswith('yajl2'):
+        return None
+    with open(json_path, 'rb') as f:
+        first = b''
+        while True:
+            chunk = f.read(4096)
+            if not chunk:
+                break
+            chunk = chunk.lstrip()
+            if chunk:
+                first = chunk[:1]
+                break
+        f.seek(0)
+        # use_float: angka jadi float (bukan Decimal) seperti json.loads
+        if first == b'[':
+            return sheets_from_items(ijson.items(f, 'item', use_float=True), flat)
+        if first == b'{':
+            return sheets_from_kvitems(ijson.kvitems(f, '', use_float=True), flat)
+    return None
+
+def flatten_sheets(sheets):
+    return {name: [flatten(r) for r in rows] for name, rows in sheets.items()}
 
 # ---------- File dialogs ----------
-def pick_file_dialog():
+def make_tk_root():
+    # satu root Tk tersembunyi untuk semua dialog (membuat Tk() = start Tcl)
     if tk is None:
         raise RuntimeError("tkinter tidak tersedia di environment ini.")
     root = tk.Tk()
     root.withdraw()
     root.attributes("-topmost", True)
+    return root
+
+def pick_file_dialog(root):
     file_path = filedialog.askopenfilename(
+        parent=root,
         title="Pilih file JSON",
         filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
     )
-    root.destroy()
     return file_path
 
-def save_file_dialog(default_name):
-    if tk is None:
-        raise RuntimeError("tkinter tidak tersedia di environment ini.")
-    root = tk.Tk()
-    root.withdraw()
-    root.attributes("-topmost", True)
+def save_file_dialog(root, default_name):
     save_path = filedialog.asksaveasfilename(
+        parent=root,
         title="Simpan file Excel sebagai (program juga akan buat CSV dengan nama yang sama)",
         defaultextension=".xlsx",
         initialfile=default_name,
         filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")]
     )
-    root.destroy()
     return save_path
 
 # ---------- Main ----------
 def main():
     print_instructions()
 
+    root, root_error = None, None
+    try:
+        root = make_tk_root()
+    except Exception as e:
+        root_error = e
+    try:
+        run(root, root_error)
+    finally:
+        if root is not None:
+            root.destroy()
+
+def run(root, root_error=None):
+    args = sys.argv[1:]
+    force_direct = '--direct-xml' in args
+    args = [a for a in args if a != '--direct-xml']
+    # engine Excel: xlsxwriter > openpyxl write-only (lewat pandas bila ada)
+    # > direct XML (tanpa dependency, atau dipaksa dengan --direct-xml)
+    if force_direct:
+        excel_engine = 'direct'
+    elif xlsxwriter is not None:
+        excel_engine = 'xlsxwriter'
+    elif Workbook is not None:
+        excel_engine = 'pandas' if USE_PANDAS else 'openpyxl'
+    else:
+        excel_engine = 'direct'
+
     # pick json file (or from argv)
-    if len(sys.argv) > 1:
-        json_path = sys.argv[1]
+    if args:
+        json_path = args[0]
         if not os.path.isfile(json_path):
             print("File tidak ditemukan:", json_path)
             return
     else:
         try:
-            json_path = pick_file_dialog()
+            if root is None:
+                raise root_error
+            json_path = pick_file_dialog(root)
         except Exception as e:
             print("Gagal membuat dialog file. Error:", e)
             print("Sebagai alternatif, jalankan: python json_to_excel_and_csv.py path/to/file.json")
@@ -271,19 +631,34 @@ def main():
         print("Tidak ada file dipilih. Keluar.")
         return
 
+    # jalur pandas menerima baris nested apa adanya (normalize_rows yang meratakan),
+    # engine lain & CSV fallback memakai baris hasil flatten
+    need_flat = excel_engine != 'pandas' or not USE_PANDAS
     try:
-        with open(json_path, 'r', encoding='utf-8') as f:
-            obj = json.load(f)
-    except Exception as e:
-        print("Gagal membaca/parse JSON:", e)
-        return
-
-    sheets = make_sheets_from_obj(obj)
+        streamed = load_sheets_streaming(json_path, flat=not USE_PANDAS)
+    except Exception:
+        streamed = None  # mis. NaN / bentuk tak terduga -> parser biasa
+    if streamed is not None:
+        raw_sheets = streamed if USE_PANDAS else None
+        if not need_flat:
+            sheets = raw_sheets
+        else:
+            sheets = flatten_sheets(streamed) if USE_PANDAS else streamed
+    else:
+        try:
+            obj = load_json_file(json_path)
+        except Exception as e:
+            print("Gagal membaca/parse JSON:", e)
+            return
+        raw_sheets = make_sheets_raw(obj) if USE_PANDAS else None
+        sheets = make_sheets_from_obj(obj) if need_flat else raw_sheets
     ts = datetime.now().strftime("%Y%m%d_%H%M%S")
     default_name = f"json_to_excel_{ts}.xlsx"
 
     try:
-        save_xlsx_path = save_file_dialog(default_name)
+        if root is None:
+            raise root_error
+        save_xlsx_path = save_file_dialog(root, default_name)
     except Exception as e:
         print("Gagal membuat dialog save. Error:", e)
         save_xlsx_path = os.path.join(os.getcwd(), default_name)
@@ -299,14 +674,22 @@ def main():
 
     try:
         # write xlsx
-        if USE_PANDAS:
-            write_excel_with_pandas(sheets, save_xlsx_path)
-        else:
+        if excel_engine == 'xlsxwriter':
+            write_excel_with_xlsxwriter(sheets, save_xlsx_path)
+        elif excel_engine == 'pandas':
+            # normalisasi sekali, DataFrame dipakai bersama oleh Excel & CSV
+            dfs = normalize_sheets(raw_sheets)
+            write_excel_with_pandas_dfs(dfs, save_xlsx_path)
+        elif excel_engine == 'openpyxl':
             write_excel_with_openpyxl(sheets, save_xlsx_path)
+        else:
+            write_excel_direct_xml(sheets, save_xlsx_path)
 
         # write combined csv
-        if USE_PANDAS:
-            write_combined_csv_with_pandas(sheets, csv_path)
+        if excel_engine == 'pandas':
+            write_combined_csv_with_pandas_dfs(dfs, csv_path)
+        elif USE_PANDAS:
+            write_combined_csv_with_pandas_dfs(normalize_sheets(raw_sheets), csv_path)
         else:
             write_combined_csv_fallback(sheets, csv_path)
 
@@ -323,13 +706,11 @@ def main():
         print("-", sanitize_sheet_name(name))
 
     # optional GUI notice
-    if tk is not None:
+    if root is not None:
         try:
-            root = tk.Tk()
-            root.withdraw()
             messagebox.showinfo("Selesai",
-                f"File Excel:\n{os.path.abspath(save_xlsx_path)}\n\nFile CSV:\n{os.path.abspath(csv_path)}")
-            root.destroy()
+                f"File Excel:\n{os.path.abspath(save_xlsx_path)}\n\nFile CSV:\n{os.path.abspath(csv_path)}",
+                parent=root)
         except Exception:
             pass
 